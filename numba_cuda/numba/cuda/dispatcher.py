@@ -1,9 +1,11 @@
+import hashlib
 import numpy as np
 import os
 import re
 import sys
 import ctypes
 import functools
+import tempfile
 
 from numba.core import config, serialize, sigutils, types, typing, utils
 from numba.core.caching import Cache, CacheImpl
@@ -15,7 +17,7 @@ from numba.core.typing.typeof import Purpose, typeof
 from numba.cuda.api import get_current_device
 from numba.cuda.args import wrap_arg
 from numba.cuda.compiler import compile_cuda, CUDACompiler, kernel_fixup
-from numba.cuda.cudadrv import driver
+from numba.cuda.cudadrv import driver, nvrtc
 from numba.cuda.cudadrv.devices import get_context
 from numba.cuda.descriptor import cuda_target
 from numba.cuda.errors import (missing_launch_config_msg,
@@ -38,6 +40,53 @@ cuda_fp16_math_funcs = ['hsin', 'hcos',
                         'htrunc', 'hdiv']
 
 
+@functools.lru_cache(maxsize=None)
+def _cached_nrt_ptx_path(cc):
+    """
+    Compile runtime/nrt.cu to PTX for the given compute capability and return
+    the path of the compiled PTX on disk. The PTX lives in a per-user cache
+    keyed by the source contents and the compute capability, so NVRTC compiles
+    the NRT source at most once per (source, CC) pair across processes rather
+    than once for every kernel that links it.
+    """
+    basedir = os.path.dirname(os.path.abspath(__file__))
+    nrt_path = os.path.join(basedir, 'runtime', 'nrt.cu')
+    with open(nrt_path, 'rb') as f:
+        source = f.read()
+
+    key = hashlib.sha256(source).hexdigest()[:16]
+    # The NVRTC version is part of the key so that PTX persisted under one
+    # toolkit is not reused after a toolkit or driver change, where it might
+    # target a PTX ISA the installed driver cannot JIT
+    nvrtc_version = nvrtc.NVRTC().get_version()
+    cache_base = os.environ.get(
+        'XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    cache_dir = os.path.join(cache_base, 'numba-cuda', 'nrt')
+    cache_path = os.path.join(
+        cache_dir, 'nrt-%s-cc%d%d-nvrtc%d.%d.ptx' % (key, *cc, *nvrtc_version)
+    )
+
+    if not os.path.isfile(cache_path):
+        ptx, _ = nvrtc.compile(source, 'nrt.cu', cc)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write and rename so that concurrent processes never observe a
+            # partially-written PTX file
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.ptx')
+            with os.fdopen(fd, 'w') as f:
+                f.write(ptx)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # An unwritable cache location costs persistence across
+            # processes, not correctness; fall back to a temporary file that
+            # the in-process memoization reuses
+            fd, cache_path = tempfile.mkstemp(suffix='.ptx')
+            with os.fdopen(fd, 'w') as f:
+                f.write(ptx)
+
+    return cache_path
+
+
 class _Kernel(serialize.ReduceMixin):
     '''
     CUDA Kernel specialized for a given set of argument types. When called, this
@@ -167,10 +216,9 @@ class _Kernel(serialize.ReduceMixin):
 
         nrt_in_asm = re.findall(pattern, asm)
 
-        basedir = os.path.dirname(os.path.abspath(__file__))
         if nrt_in_asm:
-            nrt_path = os.path.join(basedir, 'runtime', 'nrt.cu')
-            link.append(nrt_path)
+            cc = get_current_device().compute_capability
+            link.append(_cached_nrt_ptx_path(cc))
 
         return link
 
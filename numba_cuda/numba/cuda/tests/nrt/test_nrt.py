@@ -1,3 +1,4 @@
+import contextlib
 import re
 import gc
 import numpy as np
@@ -12,12 +13,98 @@ from .mock_numpy import cuda_empty
 from numba import cuda
 
 
+# Captures the callee of a `call.uni` PTX instruction. The target name
+# follows the mnemonic either directly or after a parenthesized return value
+# list; `\s` spans the line breaks PTX puts between the two.
+_P_CALL_TARGET = re.compile(
+    r"call\.uni\s*(?:\(\s*[^)]*\)\s*,\s*)?([A-Za-z_$][\w$]*)"
+)
+
+
+class _AllocStatsDelta:
+    """Holds the change in allocation stats across a block of code."""
+    alloc = 0
+    free = 0
+
+
+@contextlib.contextmanager
+def alloc_stats_delta():
+    """Capture the change in NRT allocation stats across the managed block.
+
+    Yields an object whose ``alloc`` and ``free`` attributes are filled in
+    on exit, so callers snapshot and diff the stats in one place instead of
+    making two explicit readbacks per launch.
+    """
+    delta = _AllocStatsDelta()
+    init_stats = rtsys.get_allocation_stats()
+    yield delta
+    cur_stats = rtsys.get_allocation_stats()
+    delta.alloc = cur_stats.alloc - init_stats.alloc
+    delta.free = cur_stats.free - init_stats.free
+
+
+# The kernels used by the tests are defined at module scope so that each one
+# is compiled once for the whole suite rather than once per test method.
+# Kernels that previously closed over a local variable take it as an argument
+# instead, so a single overload serves every test.
+@cuda.jit
+def kernel(n):
+    for i in range(n):
+        temp = cuda_empty(2, np.float64) # noqa: F841
+    return None
+
+
+@cuda.jit
+def f(x):
+    return x[:5]
+
+
+@cuda.jit
+def g():
+    x = cuda_empty(10, np.int64)
+    f(x)
+
+
+@cuda.jit
+def f_ret(x):
+    return x[5:]
+
+
+@cuda.jit
+def g_ret(out_ary):
+    x = cuda_empty(10, np.int64)
+    x[5] = 1
+    y = f_ret(x)
+    out_ary[0] = y[0]
+
+
 class TestNrtRefCt(EnableNRTStatsMixin, CUDATestCase):
 
-    def setUp(self):
-        # Clean up any NRT-backed objects hanging in a dead reference cycle
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Clean up any NRT-backed objects hanging in a dead reference cycle.
+        # cuda_empty only allocates on the device and hands no objects back
+        # to the host, so nothing created by these tests can re-enter a
+        # cycle between tests; one full collection per class suffices
         gc.collect()
-        super(TestNrtRefCt, self).setUp()
+        # Every test runs with NRT enabled, so flip the flag once for the
+        # whole class
+        cls._nrt_patch = patch('numba.config.CUDA_ENABLE_NRT', True,
+                               create=True)
+        cls._nrt_patch.start()
+        # Register the stop as a cleanup straight away so the patch cannot
+        # leak to later test modules if the rest of the class setup raises
+        cls.addClassCleanup(cls._nrt_patch.stop)
+        # Look up the default stream once; every test launches on the same
+        # stream so there is no need to go through the context per test
+        cls.stream = cuda.default_stream()
+        # Compile for the known argument types up front so the launches skip
+        # type inference, then prime the runtime with a warm-up launch so the
+        # first NRT allocation happens outside any test's stats window
+        kernel.compile("void(int64)")
+        kernel[1,1](1)
+        cuda.synchronize()
 
     @unittest.expectedFailure
     def test_no_return(self):
@@ -26,84 +113,68 @@ class TestNrtRefCt(EnableNRTStatsMixin, CUDATestCase):
         """
         n = 10
 
-        @cuda.jit
-        def kernel():
-            for i in range(n):
-                temp = cuda_empty(2, np.float64) # noqa: F841
-            return None
-
-        init_stats = rtsys.get_allocation_stats()
-
-        with patch('numba.config.CUDA_ENABLE_NRT', True, create=True):
-            kernel[1,1]()
-        cur_stats = rtsys.get_allocation_stats()
-        self.assertEqual(cur_stats.alloc - init_stats.alloc, n)
-        self.assertEqual(cur_stats.free - init_stats.free, n)
+        # Cover launches both on the default launch configuration and with an
+        # explicit stream; the kernel is compiled only once for both
+        for stream in (None, self.stream):
+            with self.subTest(stream=stream):
+                with alloc_stats_delta() as delta:
+                    if stream is None:
+                        kernel[1,1](n)
+                    else:
+                        kernel[1,1,stream](n)
+                self.assertEqual(delta.alloc, n)
+                self.assertEqual(delta.free, n)
 
 
 class TestNrtBasic(CUDATestCase):
-    def test_nrt_launches(self):
-        @cuda.jit
-        def f(x):
-            return x[:5]
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Transfer the output array once for the whole class; launching with
+        # the device array avoids the implicit host-to-device copy that a
+        # host ndarray argument incurs on every call
+        cls.out_ary = cuda.to_device(np.zeros(1, dtype=np.int64))
+        # Start the NRT patch at class level so the kernels can be eagerly
+        # specialized here with their known signatures; launches in the tests
+        # then skip type inference entirely
+        cls._nrt_patch = patch('numba.config.CUDA_ENABLE_NRT', True,
+                               create=True)
+        cls._nrt_patch.start()
+        # Register the stop as a cleanup straight away so the patch cannot
+        # leak to later test modules if the eager compiles below raise
+        cls.addClassCleanup(cls._nrt_patch.stop)
+        g.compile("void()")
+        g_ret.compile("void(int64[::1])")
 
-        @cuda.jit
-        def g():
-            x = cuda_empty(10, np.int64)
-            f(x)
-
-        with patch('numba.config.CUDA_ENABLE_NRT', True, create=True):
-            g[1,1]()
+    def test_nrt_launches(self):
+        g[1,1]()
         cuda.synchronize()
 
     def test_nrt_ptx_contains_refcount(self):
-        @cuda.jit
-        def f(x):
-            return x[:5]
-
-        @cuda.jit
-        def g():
-            x = cuda_empty(10, np.int64)
-            f(x)
-
-        with patch('numba.config.CUDA_ENABLE_NRT', True, create=True):
+        # This test only needs the compiled PTX, not a fresh launch; launch
+        # solely to force compilation if no other test has done so already
+        if not g.overloads:
             g[1,1]()
 
-        ptx = next(iter(g.inspect_asm().values()))
-
-        # The following checks that a `call` PTX instruction is
-        # emitted for NRT_MemInfo_alloc_aligned, NRT_incref and
-        # NRT_decref
-        p1 = r"call\.uni(.|\n)*NRT_MemInfo_alloc_aligned"
-        match = re.search(p1, ptx)
-        assert match is not None
+        # Fetch the cached PTX of the only overload directly rather than
+        # materializing the full signature -> PTX dict via inspect_asm()
+        ptx = next(iter(g.overloads.values())).library.get_asm_str()
 
-        p2 = r"call\.uni.*\n.*NRT_incref"
-        match = re.search(p2, ptx)
-        assert match is not None
-
-        p3 = r"call\.uni.*\n.*NRT_decref"
-        match = re.search(p3, ptx)
-        assert match is not None
+        # Tokenize the call sites in one pass, then check membership, rather
+        # than making a separate scan over the PTX per function of interest
+        targets = set(_P_CALL_TARGET.findall(ptx))
+        self.assertIn("NRT_MemInfo_alloc_aligned", targets)
+        self.assertIn("NRT_incref", targets)
+        self.assertIn("NRT_decref", targets)
 
     def test_nrt_returns_correct(self):
-        @cuda.jit
-        def f(x):
-            return x[5:]
-
-        @cuda.jit
-        def g(out_ary):
-            x = cuda_empty(10, np.int64)
-            x[5] = 1
-            y = f(x)
-            out_ary[0] = y[0]
-
-        out_ary = np.zeros(1, dtype=np.int64)
+        # Re-zero the reused class-level buffer so a repeated run of this
+        # test cannot pass on a value left behind by a previous launch
+        self.out_ary.copy_to_device(np.zeros(1, dtype=np.int64))
 
-        with patch('numba.config.CUDA_ENABLE_NRT', True, create=True):
-            g[1,1](out_ary)
+        g_ret[1,1](self.out_ary)
 
-        self.assertEqual(out_ary[0], 1)
+        self.assertEqual(self.out_ary.copy_to_host()[0], 1)
 
 
 if __name__ == '__main__':